@@ -0,0 +1,186 @@
+import sys
+import os
+import asyncio
+import time
+import threading
+from types import SimpleNamespace
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.health import HealthProber, CircuitBreaker, get_breaker
+from src.tools import firebase_ops, graph_ops, drive_ops
+
+# Mock Probes
+backend_up = {"firestore": True, "neo4j": True}
+
+def mock_probe_firestore():
+    if not backend_up["firestore"]:
+        raise ConnectionError("Firestore unreachable")
+
+def mock_probe_neo4j():
+    if not backend_up["neo4j"]:
+        raise ConnectionError("Neo4j unreachable")
+
+def mock_probe_hung():
+    time.sleep(0.5)
+
+# Mock Backend Clients (slow to connect, to widen the init race)
+mock_firebase_apps = []
+
+def mock_initialize_app():
+    time.sleep(0.05)
+    if mock_firebase_apps:
+        raise ValueError("The default Firebase app already exists.")
+    mock_firebase_apps.append("[DEFAULT]")
+
+mock_neo4j_drivers = []
+
+def mock_neo4j_driver(uri, auth=None):
+    driver = SimpleNamespace(verify_connectivity=lambda: time.sleep(0.05), close=lambda: None)
+    mock_neo4j_drivers.append(driver)
+    return driver
+
+def run_concurrently(target, n: int = 4):
+    errors = []
+    def _run():
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=_run) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+async def test_health():
+    print("--- STARTING HEALTH PROBER VERIFICATION ---")
+    prober = HealthProber(interval=60, timeout=0.1)
+    prober.register("firestore", mock_probe_firestore)
+    prober.register("neo4j", mock_probe_neo4j)
+
+    # 1. Not ready before the first probe
+    print("\n[TEST 1] Readiness Before First Probe")
+    if not prober.readiness(["firestore", "neo4j"])["ready"]:
+        print("[SUCCESS] Not ready until probed.")
+    else:
+        print("[FAIL] Reported ready without probing.")
+
+    # 2. All backends healthy
+    print("\n[TEST 2] Healthy Backends")
+    await prober.probe_all()
+    report = prober.readiness(["firestore", "neo4j"])
+    if report["ready"] and report["backends"]["neo4j"]["circuit"] == CircuitBreaker.CLOSED:
+        print(f"[SUCCESS] Ready: {report}")
+    else:
+        print(f"[FAIL] Unexpected report: {report}")
+
+    # 3. A single failed probe marks the backend not ready but keeps the circuit closed
+    print("\n[TEST 3] Transient Failure")
+    backend_up["neo4j"] = False
+    await prober.probe_all()
+    report = prober.readiness(["firestore", "neo4j"])
+    if not report["ready"] and get_breaker("neo4j").allow():
+        print(f"[SUCCESS] Not ready, neo4j circuit still closed: {report['backends']['neo4j']['error']}")
+    else:
+        print(f"[FAIL] Unexpected report: {report}")
+
+    # 3b. Consecutive failed probes open the breaker so tools fail fast
+    print("\n[TEST 3b] Backend Down")
+    for _ in range(get_breaker("neo4j").failure_threshold - 1):
+        await prober.probe_all()
+    if not get_breaker("neo4j").allow() and get_breaker("firestore").allow():
+        print("[SUCCESS] neo4j circuit open after consecutive failures.")
+    else:
+        print(f"[FAIL] Unexpected circuit state: {get_breaker('neo4j').state}")
+
+    # 4. Recovery closes the breaker
+    print("\n[TEST 4] Backend Recovered")
+    backend_up["neo4j"] = True
+    await prober.probe_all()
+    if prober.readiness(["firestore", "neo4j"])["ready"] and get_breaker("neo4j").allow():
+        print("[SUCCESS] Ready again, circuit closed.")
+    else:
+        print("[FAIL] Backend did not recover.")
+
+    # 4b. A required backend that was never registered is not ready
+    print("\n[TEST 4b] Unregistered Backend")
+    report = prober.readiness(["firestore", "neo4j", "neo4jj"])
+    if not report["ready"] and report["backends"]["neo4jj"]["error"] == "Backend not registered":
+        print("[SUCCESS] Unregistered backend reported as not ready.")
+    else:
+        print(f"[FAIL] Unexpected report: {report}")
+
+    # 5. Hung probes time out
+    print("\n[TEST 5] Probe Timeout")
+    prober.register("drive", mock_probe_hung)
+    await prober.probe("drive")
+    state = prober.states["drive"]
+    if state.healthy is False and "timed out" in state.error:
+        print(f"[SUCCESS] {state.error}")
+    else:
+        print(f"[FAIL] Unexpected state: {state}")
+
+    # 6. Inline failures trip the breaker after the threshold; half-open after the reset timeout
+    print("\n[TEST 6] Inline Circuit Breaker")
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure("boom")
+    still_closed = breaker.allow()
+    breaker.record_failure("boom")
+    opened = not breaker.allow()
+    time.sleep(0.06)
+    half_open = breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    if still_closed and opened and half_open:
+        print("[SUCCESS] Breaker opened after 2 failures and half-opened after the reset timeout.")
+    else:
+        print(f"[FAIL] Unexpected breaker state: {breaker.state}")
+
+    # 7. Concurrent Firestore initialization runs once
+    print("\n[TEST 7] Concurrent Firestore Init")
+    firebase_ops.firebase_admin = SimpleNamespace(_apps=mock_firebase_apps, initialize_app=mock_initialize_app)
+    firebase_ops.firestore = SimpleNamespace(client=lambda: object())
+    errors = run_concurrently(firebase_ops._connect_firestore)
+    if not errors and firebase_ops._db is not None and len(mock_firebase_apps) == 1:
+        print("[SUCCESS] Firebase initialized once.")
+    else:
+        print(f"[FAIL] Concurrent init errors: {errors}")
+    firebase_ops._db = None
+
+    # 8. Concurrent Neo4j initialization creates one driver
+    print("\n[TEST 8] Concurrent Neo4j Init")
+    os.environ.update({"NEO4J_URI": "bolt://mock", "NEO4J_USER": "neo4j", "NEO4J_PASSWORD": "mock"})
+    graph_ops.GraphDatabase = SimpleNamespace(driver=mock_neo4j_driver)
+    errors = run_concurrently(graph_ops._connect_neo4j)
+    if not errors and len(mock_neo4j_drivers) == 1 and graph_ops._driver is mock_neo4j_drivers[0]:
+        print("[SUCCESS] One Neo4j driver created.")
+    else:
+        print(f"[FAIL] {len(mock_neo4j_drivers)} drivers created, errors: {errors}")
+    graph_ops._driver = None
+
+    # 9. Drive auth failures count once per attempt; inline successes close the circuit
+    print("\n[TEST 9] Drive Breaker Accounting")
+    drive_breaker = get_breaker("drive")
+    drive_breaker.record_success()
+    def mock_auth_failure(scopes=None):
+        raise RuntimeError("No credentials")
+    drive_ops.google.auth.default = mock_auth_failure
+    drive_prober = HealthProber(interval=60, timeout=1)
+    drive_prober.register("drive", drive_ops.probe_drive)
+    await drive_prober.probe("drive")
+    probe_failures = drive_breaker.failures
+    drive_ops.delete_file(file_id="123")
+    inline_failures = drive_breaker.failures
+    mock_service = SimpleNamespace(files=lambda: SimpleNamespace(delete=lambda fileId: SimpleNamespace(execute=lambda: None)))
+    drive_ops._get_drive_service = lambda: mock_service
+    drive_ops.delete_file(file_id="123")
+    if probe_failures == 1 and inline_failures == 2 and drive_breaker.failures == 0:
+        print("[SUCCESS] One failure per attempt; inline success reset the count.")
+    else:
+        print(f"[FAIL] Failures after probe/inline/success: {probe_failures}/{inline_failures}/{drive_breaker.failures}")
+
+    print("\n--- HEALTH PROBER VERIFICATION COMPLETE ---")
+
+if __name__ == "__main__":
+    asyncio.run(test_health())
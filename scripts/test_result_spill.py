@@ -0,0 +1,121 @@
+import sys
+import os
+import asyncio
+import json
+import tempfile
+from typing import Any, Dict, List
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Spill mode is configured from the environment at import time
+os.environ["SAOL_SPILL_ENABLED"] = "true"
+os.environ["SAOL_SPILL_THRESHOLD_BYTES"] = "1024"
+
+from mcp.server import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import ResourceLink
+from src.core.result_store import ResultStore, result_store
+from src.middleware.spill import spill_middleware
+
+# Mock Tools
+def mock_read_queue(limit: int = 10) -> List[Dict[str, Any]]:
+    print(f"[MOCK] Reading {limit} tickets...")
+    return [{"id": f"ticket-{i}", "status": "PENDING", "payload": "x" * 100} for i in range(limit)]
+
+def mock_cypher_query(query: str, params: dict = {}) -> list:
+    return [{"error": "Neo4j not initialized"}]
+
+protected_read_queue = spill_middleware(mock_read_queue)
+protected_cypher = spill_middleware(mock_cypher_query)
+
+async def _call_over_mcp():
+    """Calls a spilling tool through a real MCP client session and follows the resource link."""
+    server = FastMCP("spill-test")
+    server.tool()(protected_read_queue)
+
+    @server.resource("saol://results/{result_id}", mime_type="application/json")
+    def read_spilled_result(result_id: str) -> str:
+        return result_store.read(result_id).decode("ascii")
+
+    async with create_connected_server_and_client_session(server._mcp_server) as client:
+        result = await client.call_tool("mock_read_queue", {"limit": 50})
+        links = [c for c in result.content if isinstance(c, ResourceLink)]
+        contents = await client.read_resource(links[0].uri) if links else None
+        return result, links, contents
+
+def test_result_spill():
+    print("--- STARTING RESULT SPILL VERIFICATION ---")
+
+    # 1. Small results stay inline
+    print("\n[TEST 1] Small Result (Inline)")
+    result = protected_read_queue(limit=2)
+    if len(result) == 2 and "spilled" not in result[0]:
+        print("[SUCCESS] Small result returned inline.")
+    else:
+        print(f"[FAIL] Unexpected result: {result}")
+
+    # 2. Large results are spilled and readable in ranges
+    print("\n[TEST 2] Large Result (Spilled)")
+    result = protected_read_queue(limit=50)
+    ref = result.structuredContent["result"][0]
+    if ref.get("spilled") and ref["item_count"] == 50:
+        result_id = ref["resource_uri"].rsplit("/", 1)[1]
+        full = result_store.read(result_id)
+        head = result_store.read(result_id, 0, 16)
+        if json.loads(full) == mock_read_queue(limit=50) and full[:16] == head:
+            print(f"[SUCCESS] Result spilled to {ref['resource_uri']} ({ref['size_bytes']} bytes).")
+        else:
+            print("[FAIL] Stored payload does not match the tool result.")
+    else:
+        print(f"[FAIL] Result was NOT spilled: {result}")
+
+    # 3. Error results are never spilled
+    print("\n[TEST 3] Error Result (Inline)")
+    result = protected_cypher(query="MATCH (n) RETURN n")
+    if result == [{"error": "Neo4j not initialized"}]:
+        print("[SUCCESS] Error returned inline.")
+    else:
+        print(f"[FAIL] Unexpected result: {result}")
+
+    # 4. Memory-mapped store is bounded
+    print("\n[TEST 4] Memory-Mapped Store (Eviction)")
+    with tempfile.TemporaryDirectory() as spill_dir:
+        store = ResultStore(max_entries=2, spill_dir=spill_dir)
+        first = store.put(b"[1]")
+        store.put(b"[2]")
+        third = store.put(b"[3]")
+        if store.get(first.result_id) is None and store.read(third.result_id) == b"[3]" and len(os.listdir(store.spill_dir)) == 2:
+            print("[SUCCESS] Oldest entry evicted and its file removed.")
+        else:
+            print("[FAIL] Store exceeded its bounds.")
+        # Release the mappings before the directory is removed
+        for rid in list(store._entries):
+            store._evict(rid)
+
+    # 5. Spill files left by dead processes are removed at startup
+    print("\n[TEST 5] Stale Spill Cleanup")
+    with tempfile.TemporaryDirectory() as spill_dir:
+        dead_proc = os.path.join(spill_dir, "proc-999999999")
+        os.makedirs(dead_proc)
+        open(os.path.join(dead_proc, "old.bin"), "wb").close()
+        open(os.path.join(spill_dir, "legacy.bin"), "wb").close()
+        store = ResultStore(spill_dir=spill_dir)
+        if os.listdir(spill_dir) == [os.path.basename(store.spill_dir)]:
+            print("[SUCCESS] Stale spill files removed.")
+        else:
+            print(f"[FAIL] Stale files remain: {os.listdir(spill_dir)}")
+
+    # 6. Over MCP, the spilled result is a resource link the client can read
+    print("\n[TEST 6] MCP Resource Link")
+    result, links, contents = asyncio.run(_call_over_mcp())
+    if (not result.isError and len(links) == 1
+            and json.loads(contents.contents[0].text) == mock_read_queue(limit=50)):
+        print(f"[SUCCESS] Tool returned a resource link to {links[0].uri} ({links[0].size} bytes).")
+    else:
+        print(f"[FAIL] Unexpected MCP result: {result}")
+
+    print("\n--- RESULT SPILL VERIFICATION COMPLETE ---")
+
+if __name__ == "__main__":
+    test_result_spill()
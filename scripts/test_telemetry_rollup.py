@@ -0,0 +1,163 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google.api_core.exceptions import InvalidArgument
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import firestore as gcloud_firestore
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.batch import WriteBatch
+from google.cloud.firestore_v1.document import DocumentReference
+from src.core.telemetry_rollup import rollup_id, rollup_increments, summarize_rollups, histogram_percentile
+from src.tools import firebase_ops
+from src.tools.telemetry_ops import _rollup_update, log_mission_receipt
+
+# Record Firestore writes instead of sending them (the client itself is real and builds real write protos)
+committed_batches = []
+ledger_sets = []
+reject_rollups = {"enabled": False}
+
+def mock_commit(self, *args, **kwargs):
+    if reject_rollups["enabled"] and len(self._write_pbs) > 1:
+        raise InvalidArgument("Field name is reserved.")
+    committed_batches.append(list(self._write_pbs))
+    return []
+
+def mock_set(self, document_data, merge=False, **kwargs):
+    ledger_sets.append(document_data)
+
+WriteBatch.commit = mock_commit
+DocumentReference.set = mock_set
+firebase_ops._db = gcloud_firestore.Client(project="saol-test", credentials=AnonymousCredentials())
+
+# Mock Receipts (shaped like MissionReceipt)
+def mock_receipt(spoke_id: str, profile: str, status: str, start: datetime, duration_s: float, tools: dict):
+    return SimpleNamespace(
+        ticket_id="ticket-123", spoke_id=spoke_id, profile=profile, status=status,
+        start_time=start, end_time=start + timedelta(seconds=duration_s),
+        tokens_input=100, tokens_output=50, tool_usage=tools,
+    )
+
+# Mirror of the Firestore merge: dimensions set, numbers (and nested maps) incremented
+def apply_rollup(store: dict, receipt):
+    rollup = rollup_increments(receipt)
+    dims = rollup["dimensions"]
+    doc = store.setdefault(rollup_id(dims["bucket_start"], dims["spoke_id"], dims["profile"], dims["status"]), dict(dims))
+    for key, value in rollup["increments"].items():
+        if isinstance(value, dict):
+            target = doc.setdefault(key, {})
+            for k, v in value.items():
+                target[k] = target.get(k, 0) + v
+        else:
+            doc[key] = doc.get(key, 0) + value
+    doc["duration_ms_max"] = max(doc.get("duration_ms_max", 0.0), rollup["duration_ms"])
+
+def test_telemetry_rollup():
+    print("--- STARTING TELEMETRY ROLLUP VERIFICATION ---")
+    start = datetime(2026, 10, 19, 9, 15, tzinfo=timezone.utc)
+    store = {}
+    for i in range(100):
+        apply_rollup(store, mock_receipt("spoke-a", "researcher", "SUCCESS", start, 1 + i * 0.01, {"read_queue": 1, "update_ticket": 2}))
+    for i in range(50):
+        apply_rollup(store, mock_receipt("spoke-b", "writer", "FAILED", start + timedelta(hours=1), 20, {"upload_file": 1}))
+
+    # 1. Receipts collapse into one document per bucket/spoke/profile/status
+    print("\n[TEST 1] Rollup Documents")
+    if len(store) == 2:
+        print(f"[SUCCESS] 150 receipts rolled up into {len(store)} documents: {sorted(store)}")
+    else:
+        print(f"[FAIL] Unexpected rollup documents: {sorted(store)}")
+
+    # 2. Per-profile aggregates
+    print("\n[TEST 2] Group By Profile")
+    groups = summarize_rollups(store.values(), "profile")
+    researcher = groups.get("researcher", {})
+    if (researcher.get("count") == 100 and researcher.get("tokens_total") == 15000
+            and researcher.get("tool_usage") == {"update_ticket": 200, "read_queue": 100}
+            and 1000 <= researcher.get("duration_ms_p50") <= 2500):
+        print(f"[SUCCESS] researcher: {researcher}")
+    else:
+        print(f"[FAIL] Unexpected aggregates: {groups}")
+
+    # 3. Filters and totals
+    print("\n[TEST 3] Filtered Total")
+    total = summarize_rollups(store.values(), None, {"status": "FAILED"})
+    if list(total) == ["total"] and total["total"]["count"] == 50 and total["total"]["duration_ms_p99"] <= 20000:
+        print(f"[SUCCESS] FAILED total: {total['total']}")
+    else:
+        print(f"[FAIL] Unexpected total: {total}")
+
+    # 4. Percentile estimate stays within the observed range
+    print("\n[TEST 4] Histogram Percentiles")
+    p = histogram_percentile({"0": 90, "3": 10}, 0.99, max_ms=800)
+    if p is not None and 500 <= p <= 800:
+        print(f"[SUCCESS] p99 estimated at {p}ms.")
+    else:
+        print(f"[FAIL] Unexpected p99: {p}")
+
+    # 5. Rollup IDs are unique per dimension combination
+    print("\n[TEST 5] Rollup ID Collisions")
+    ids = {
+        rollup_id(start, "worker_1", "default", "SUCCESS"),
+        rollup_id(start, "worker", "1_default", "SUCCESS"),
+        rollup_id(start, "a/b", "default", "SUCCESS"),
+        rollup_id(start, "a_b", "default", "SUCCESS"),
+    }
+    if len(ids) == 4 and not any("/" in i for i in ids):
+        print("[SUCCESS] Distinct dimensions map to distinct IDs.")
+    else:
+        print(f"[FAIL] Colliding IDs: {ids}")
+
+    # 6. The real Firestore set-with-merge write never overwrites stored maps
+    print("\n[TEST 6] Firestore Merge Write")
+    receipt = {
+        "ticket_id": "ticket-123", "spoke_id": "spoke-a", "profile": "researcher", "status": "SUCCESS",
+        "start_time": start.isoformat(), "end_time": (start + timedelta(seconds=2)).isoformat(),
+    }
+    doc_id, fields = _rollup_update(receipt)
+    write = _helpers.pbs_for_set_with_merge(f"projects/p/databases/(default)/documents/telemetry_rollups/{doc_id}", fields, merge=True)[0]
+    masked = set(write.update_mask.field_paths)
+    transformed = {t.field_path for t in write.update_transforms}
+    if masked.isdisjoint({"tool_usage", "duration_hist", "count"}) and {"count", "duration_hist.`4`"} <= transformed:
+        print(f"[SUCCESS] Only dimensions are overwritten: {sorted(masked)}")
+    else:
+        print(f"[FAIL] Merge overwrites aggregates: mask={sorted(masked)} transforms={sorted(transformed)}")
+
+    # 7. Invalid tool names are skipped instead of breaking the write
+    print("\n[TEST 7] Invalid Field Names")
+    odd_receipt = {**receipt, "tool_usage": {"": 1, "__name__": 2, "read_queue": 3}}
+    doc_id, fields = _rollup_update(odd_receipt)
+    write = _helpers.pbs_for_set_with_merge(f"projects/p/databases/(default)/documents/telemetry_rollups/{doc_id}", fields, merge=True)[0]
+    tool_paths = {t.field_path for t in write.update_transforms if t.field_path.startswith("tool_usage")}
+    if tool_paths == {"tool_usage.read_queue"}:
+        print(f"[SUCCESS] Only valid tool names kept: {sorted(tool_paths)}")
+    else:
+        print(f"[FAIL] Unexpected tool usage paths: {sorted(tool_paths)}")
+
+    # 8. The ledger entry and rollup are committed together
+    print("\n[TEST 8] Ledger And Rollup Batch")
+    valid_receipt = {**receipt, "tool_usage": {"read_queue": 3}}
+    result = log_mission_receipt(valid_receipt)
+    if result.startswith("Telemetry logged successfully") and len(committed_batches[-1]) == 2:
+        print(f"[SUCCESS] {result}")
+    else:
+        print(f"[FAIL] Unexpected result: {result}")
+
+    # 9. A rejected rollup falls back to logging the receipt alone
+    print("\n[TEST 9] Rejected Rollup Fallback")
+    reject_rollups["enabled"] = True
+    result = log_mission_receipt(valid_receipt)
+    reject_rollups["enabled"] = False
+    if result.startswith("Telemetry logged successfully") and ledger_sets == [valid_receipt]:
+        print(f"[SUCCESS] Receipt logged without its rollup: {result}")
+    else:
+        print(f"[FAIL] Receipt lost: {result}")
+
+    print("\n--- TELEMETRY ROLLUP VERIFICATION COMPLETE ---")
+
+if __name__ == "__main__":
+    test_telemetry_rollup()
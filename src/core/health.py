@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HEALTH_INTERVAL_SECONDS = float(os.getenv("SAOL_HEALTH_INTERVAL_SECONDS", "15"))
+HEALTH_TIMEOUT_SECONDS = float(os.getenv("SAOL_HEALTH_TIMEOUT_SECONDS", "5"))
+READINESS_BACKENDS = [b.strip() for b in os.getenv("SAOL_READINESS_BACKENDS", "firestore,neo4j,drive").split(",") if b.strip()]
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker.
+    CLOSED: calls go through. OPEN: callers fail fast instead of re-attempting initialization inline.
+    It opens after `failure_threshold` failures in a row; any success resets the count.
+    After `reset_timeout` an OPEN breaker turns HALF_OPEN and lets calls through again;
+    the next recorded success closes it and the next failure re-opens it.
+    The health prober records every probe, so a backend that stays down is cut off within a few probe intervals.
+    """
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Returns False while the breaker is OPEN."""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            return self.state != self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed.")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.last_error = None
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened: {error}")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Returns the shared circuit breaker for a backend, creating it on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+@dataclass
+class BackendHealth:
+    """Cached result of the latest probe of one backend."""
+    name: str
+    healthy: Optional[bool] = None  # None until the first probe completes
+    checked_at: Optional[float] = None
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class HealthProber:
+    """
+    Periodically probes registered backends in worker threads and caches their state.
+    Readiness checks read the cache, so they never wait on a backend.
+    """
+
+    def __init__(self, interval: float = HEALTH_INTERVAL_SECONDS, timeout: float = HEALTH_TIMEOUT_SECONDS):
+        self.interval = interval
+        self.timeout = timeout
+        self.probes: Dict[str, Callable[[], None]] = {}
+        self.states: Dict[str, BackendHealth] = {}
+        self._in_flight: Dict[str, bool] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, probe: Callable[[], None]):
+        """Registers a blocking probe that raises if the backend is unavailable."""
+        self.probes[name] = probe
+        self.states[name] = BackendHealth(name=name)
+        self._in_flight[name] = False
+
+    async def probe(self, name: str):
+        state = self.states[name]
+        breaker = get_breaker(name)
+        if self._in_flight[name]:
+            # A previous probe is still hung in its thread; don't pile up more.
+            error = "Previous probe still running"
+        else:
+            self._in_flight[name] = True
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(asyncio.to_thread(self._run_probe, name), self.timeout)
+                error = None
+            except asyncio.TimeoutError:
+                error = f"Probe timed out after {self.timeout}s"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            state.latency_ms = round((time.monotonic() - start) * 1000, 1)
+
+        state.checked_at = time.time()
+        state.healthy = error is None
+        state.error = error
+        if error is None:
+            breaker.record_success()
+        else:
+            breaker.record_failure(error)
+
+    def _run_probe(self, name: str):
+        try:
+            self.probes[name]()
+        finally:
+            self._in_flight[name] = False
+
+    async def probe_all(self):
+        await asyncio.gather(*(self.probe(name) for name in self.probes))
+
+    async def run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Health probe cycle failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def readiness(self, required: List[str] = READINESS_BACKENDS) -> Dict:
+        """
+        Returns the cached readiness report; `ready` is True only if every required backend is healthy.
+        A required backend that was never registered (e.g. a typo in SAOL_READINESS_BACKENDS) counts as not ready.
+        """
+        backends = {}
+        for name, state in self.states.items():
+            report = asdict(state)
+            report["circuit"] = get_breaker(name).state
+            backends[name] = report
+        for name in required:
+            if name not in self.states:
+                backends[name] = asdict(BackendHealth(name=name, healthy=False, error="Backend not registered"))
+        ready = all(backends[name]["healthy"] for name in required)
+        return {"ready": ready, "backends": backends}
+
+
+prober = HealthProber()
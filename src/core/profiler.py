@@ -0,0 +1,59 @@
+import math
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+MAX_PROFILE_SECONDS = 60.0
+MIN_INTERVAL_SECONDS = 0.001
+
+# Only one profile may run at a time; concurrent samplers would skew each other.
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running."""
+    pass
+
+
+def _frame_stack(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+def sample_profile(seconds: float = 5.0, interval: float = 0.01) -> str:
+    """
+    Samples the stacks of every thread in the live process for `seconds` (capped at MAX_PROFILE_SECONDS).
+    Returns the samples in collapsed-stack format ("thread;frame;frame count" per line),
+    which flamegraph.pl and speedscope load directly.
+    Raises ValueError for non-finite arguments.
+    """
+    if not math.isfinite(seconds) or not math.isfinite(interval):
+        raise ValueError("seconds and interval must be finite")
+    seconds = min(max(seconds, 0.0), MAX_PROFILE_SECONDS)
+    interval = min(max(interval, MIN_INTERVAL_SECONDS), MAX_PROFILE_SECONDS)
+
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+
+    try:
+        own_ident = threading.get_ident()
+        counts: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names: Dict[int, str] = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                counts[f"{names.get(ident, ident)};{_frame_stack(frame)}"] += 1
+            # Never sleep past the deadline, so the profile stays time-boxed whatever the interval.
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0.0)))
+    finally:
+        _profile_lock.release()
+
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
@@ -0,0 +1,213 @@
+import io
+import json
+import logging
+import mmap
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESULT_URI_PREFIX = "saol://results/"
+
+
+@dataclass
+class StoredResult:
+    """
+    A single spilled tool result. The payload lives either in memory (`data`)
+    or in a file on local disk that is memory-mapped for range reads (`path`).
+    """
+    result_id: str
+    size_bytes: int
+    created_at: float
+    expires_at: float
+    mime_type: str = "application/json"
+    summary: Dict[str, Any] = field(default_factory=dict)
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+    _mmap: Optional[mmap.mmap] = None
+
+    @property
+    def uri(self) -> str:
+        return f"{RESULT_URI_PREFIX}{self.result_id}"
+
+    def read(self, offset: int = 0, length: Optional[int] = None) -> bytes:
+        end = self.size_bytes if length is None else min(self.size_bytes, offset + length)
+        if self._mmap is not None:
+            return self._mmap[offset:end]
+        return self.data[offset:end]
+
+    def open_stream(self) -> BinaryIO:
+        """Returns an independent file-like object over the payload."""
+        if self.path:
+            return open(self.path, "rb")
+        return io.BytesIO(self.data)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Failed to remove spilled result {self.path}: {e}")
+
+
+class ResultStore:
+    """
+    Bounded, TTL'd store for oversized tool results.
+    Evicts the oldest entries once `max_entries` or `max_bytes` is exceeded.
+    If `spill_dir` is set, payloads are written to a per-process subdirectory of it and memory-mapped
+    instead of held in memory. Files left behind by crashed or restarted processes are removed at startup.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: float = 900, spill_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill_dir = os.path.join(spill_dir, f"proc-{os.getpid()}") if spill_dir else None
+        self._entries: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        if self.spill_dir:
+            _remove_stale_spills(spill_dir)
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    def put(self, payload: bytes, summary: Optional[Dict[str, Any]] = None,
+            mime_type: str = "application/json") -> StoredResult:
+        """Stores a payload and returns its entry."""
+        if len(payload) > self.max_bytes:
+            raise ValueError(f"Result of {len(payload)} bytes exceeds store capacity of {self.max_bytes} bytes")
+
+        now = time.time()
+        entry = StoredResult(
+            result_id=uuid.uuid4().hex,
+            size_bytes=len(payload),
+            created_at=now,
+            expires_at=now + self.ttl_seconds,
+            mime_type=mime_type,
+            summary=summary or {},
+        )
+
+        if self.spill_dir:
+            entry.path = os.path.join(self.spill_dir, f"{entry.result_id}.bin")
+            with open(entry.path, "wb") as f:
+                f.write(payload)
+            if entry.size_bytes:
+                with open(entry.path, "rb") as f:
+                    entry._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                entry.data = b""
+        else:
+            entry.data = payload
+
+        with self._lock:
+            self._purge_expired(now)
+            self._entries[entry.result_id] = entry
+            self._total_bytes += entry.size_bytes
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+        logger.info(f"Stored result {entry.result_id} ({entry.size_bytes} bytes).")
+        return entry
+
+    def get(self, result_id: str) -> Optional[StoredResult]:
+        """Returns the entry for `result_id`, or None if unknown or expired."""
+        with self._lock:
+            self._purge_expired(time.time())
+            return self._entries.get(result_id)
+
+    def resolve(self, uri: str) -> Optional[StoredResult]:
+        """Returns the entry referenced by a `saol://results/<id>` URI."""
+        if not uri.startswith(RESULT_URI_PREFIX):
+            return None
+        return self.get(uri[len(RESULT_URI_PREFIX):].split("/", 1)[0])
+
+    def read(self, result_id: str, offset: int = 0, length: Optional[int] = None) -> Optional[bytes]:
+        """Reads a byte range of a stored result, or None if it is not available."""
+        if offset < 0 or (length is not None and length < 0):
+            raise ValueError("offset and length must be non-negative")
+        with self._lock:
+            self._purge_expired(time.time())
+            entry = self._entries.get(result_id)
+            if entry is None:
+                return None
+            return entry.read(offset, length)
+
+    def _purge_expired(self, now: float):
+        expired = [rid for rid, entry in self._entries.items() if entry.expires_at <= now]
+        for rid in expired:
+            self._evict(rid)
+
+    def _evict(self, result_id: str):
+        entry = self._entries.pop(result_id)
+        self._total_bytes -= entry.size_bytes
+        entry.close()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _remove_stale_spills(root: str):
+    """
+    Removes spill files no live process owns: loose *.bin files and proc-<pid> directories of dead processes.
+    Our own pid's directory is stale too (a restarted container reuses pids). Live sibling workers are left alone.
+    """
+    if not os.path.isdir(root):
+        return
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if name.endswith(".bin") and os.path.isfile(path):
+                os.remove(path)
+            elif name.startswith("proc-") and os.path.isdir(path):
+                pid = int(name[len("proc-"):])
+                if pid != os.getpid() and _pid_alive(pid):
+                    continue
+                shutil.rmtree(path)
+            else:
+                continue
+            logger.info(f"Removed stale spill data {path}.")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to remove stale spill data {path}: {e}")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+SPILL_ENABLED = os.getenv("SAOL_SPILL_ENABLED", "false").lower() in ("1", "true", "yes")
+SPILL_THRESHOLD_BYTES = _env_int("SAOL_SPILL_THRESHOLD_BYTES", 64 * 1024)
+
+result_store = ResultStore(
+    max_entries=_env_int("SAOL_SPILL_MAX_ENTRIES", 64),
+    max_bytes=_env_int("SAOL_SPILL_MAX_BYTES", 256 * 1024 * 1024),
+    ttl_seconds=_env_int("SAOL_SPILL_TTL_SECONDS", 900),
+    spill_dir=os.getenv("SAOL_SPILL_DIR") or None,
+)
+
+
+def serialize_result(result: Any) -> bytes:
+    """
+    Serializes a tool result to JSON bytes.
+    ASCII-only output keeps byte offsets and character offsets identical, so ranges never split a character.
+    """
+    return json.dumps(result, default=str, ensure_ascii=True).encode("ascii")
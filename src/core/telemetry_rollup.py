@@ -0,0 +1,155 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+# Rollups aggregate MissionReceipts per (time bucket, spoke, profile, status).
+# Every receipt updates exactly one rollup document, so aggregate queries read
+# (buckets x dimension combinations) documents no matter how many receipts were logged.
+BUCKET_SECONDS = 3600
+
+# Upper bounds (ms) of the duration histogram buckets; the final bucket holds everything above.
+# Percentiles are estimated from this histogram, since exact ones would need every sample.
+DURATION_BOUNDS_MS = [
+    100, 250, 500, 1_000, 2_500, 5_000, 10_000, 30_000,
+    60_000, 120_000, 300_000, 600_000, 1_800_000, 3_600_000,
+]
+
+DIMENSIONS = ("spoke_id", "profile", "status")
+GROUP_BY_OPTIONS = DIMENSIONS + ("bucket",)
+
+
+def bucket_start(ts: datetime) -> datetime:
+    """Floors a timestamp to the start of its UTC rollup bucket."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    epoch = int(ts.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % BUCKET_SECONDS, tz=timezone.utc)
+
+
+def duration_bucket(duration_ms: float) -> int:
+    """Returns the histogram bucket index for a duration."""
+    for i, bound in enumerate(DURATION_BOUNDS_MS):
+        if duration_ms <= bound:
+            return i
+    return len(DURATION_BOUNDS_MS)
+
+
+def rollup_id(bucket: datetime, spoke_id: str, profile: str, status: str) -> str:
+    """
+    Document ID of the rollup a receipt belongs to.
+    The dimensions are hashed as a JSON array, so distinct combinations can't collide
+    (joining them with a separator can) and no '/' reaches the Firestore ID.
+    """
+    digest = hashlib.sha256(json.dumps([spoke_id, profile, status]).encode("utf-8")).hexdigest()
+    return f"{bucket:%Y%m%dT%H%M}_{digest}"
+
+
+def rollup_increments(receipt) -> Dict[str, Any]:
+    """
+    Computes the fields a MissionReceipt adds to its rollup document.
+    Dimension fields are set as-is; numeric fields (including nested maps) are increments.
+    """
+    status = getattr(receipt.status, "value", receipt.status)
+    duration_ms = max((receipt.end_time - receipt.start_time).total_seconds() * 1000, 0.0)
+    return {
+        "dimensions": {
+            "bucket_start": bucket_start(receipt.start_time),
+            "spoke_id": receipt.spoke_id,
+            "profile": receipt.profile,
+            "status": status,
+        },
+        "increments": {
+            "count": 1,
+            "tokens_input": receipt.tokens_input,
+            "tokens_output": receipt.tokens_output,
+            "duration_ms_sum": duration_ms,
+            "duration_hist": {str(duration_bucket(duration_ms)): 1},
+            "tool_usage": dict(receipt.tool_usage),
+        },
+        "duration_ms": duration_ms,
+    }
+
+
+def histogram_percentile(hist: Dict[str, int], q: float, max_ms: Optional[float] = None) -> Optional[float]:
+    """
+    Estimates the q-quantile (0..1) from a duration histogram by interpolating within the bucket that holds it.
+    The overflow bucket is bounded by `max_ms` when known.
+    """
+    total = sum(hist.values())
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i in range(len(DURATION_BOUNDS_MS) + 1):
+        n = hist.get(str(i), 0)
+        if n and seen + n >= rank:
+            lower = DURATION_BOUNDS_MS[i - 1] if i > 0 else 0
+            upper = DURATION_BOUNDS_MS[i] if i < len(DURATION_BOUNDS_MS) else (max_ms or lower)
+            if max_ms is not None:
+                upper = min(upper, max(max_ms, lower))
+            return round(lower + (upper - lower) * (rank - seen) / n, 1)
+        seen += n
+    return None
+
+
+def _merge_counts(target: Dict[str, int], source: Optional[Dict[str, int]]):
+    for key, value in (source or {}).items():
+        target[key] = target.get(key, 0) + value
+
+
+def summarize_rollups(docs: Iterable[Dict[str, Any]], group_by: Optional[str] = None,
+                      filters: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Merges rollup documents into per-group aggregates.
+    `group_by` is one of GROUP_BY_OPTIONS or None for a single total; `filters` match dimension values exactly.
+    """
+    filters = {k: v for k, v in (filters or {}).items() if v is not None}
+    groups: Dict[str, Dict[str, Any]] = {}
+
+    for doc in docs:
+        if any(doc.get(k) != v for k, v in filters.items()):
+            continue
+        if group_by == "bucket":
+            key = doc["bucket_start"].isoformat() if isinstance(doc.get("bucket_start"), datetime) else str(doc.get("bucket_start"))
+        elif group_by:
+            key = str(doc.get(group_by))
+        else:
+            key = "total"
+
+        agg = groups.setdefault(key, {
+            "count": 0, "tokens_input": 0, "tokens_output": 0,
+            "duration_ms_sum": 0.0, "duration_ms_max": None,
+            "duration_hist": {}, "tool_usage": {},
+        })
+        agg["count"] += doc.get("count", 0)
+        agg["tokens_input"] += doc.get("tokens_input", 0)
+        agg["tokens_output"] += doc.get("tokens_output", 0)
+        agg["duration_ms_sum"] += doc.get("duration_ms_sum", 0.0)
+        if doc.get("duration_ms_max") is not None:
+            agg["duration_ms_max"] = max(agg["duration_ms_max"] or 0.0, doc["duration_ms_max"])
+        _merge_counts(agg["duration_hist"], doc.get("duration_hist"))
+        _merge_counts(agg["tool_usage"], doc.get("tool_usage"))
+
+    results = {}
+    for key, agg in groups.items():
+        hist, max_ms = agg["duration_hist"], agg["duration_ms_max"]
+        results[key] = {
+            "count": agg["count"],
+            "tokens_input": agg["tokens_input"],
+            "tokens_output": agg["tokens_output"],
+            "tokens_total": agg["tokens_input"] + agg["tokens_output"],
+            "duration_ms_avg": round(agg["duration_ms_sum"] / agg["count"], 1) if agg["count"] else None,
+            "duration_ms_p50": histogram_percentile(hist, 0.50, max_ms),
+            "duration_ms_p90": histogram_percentile(hist, 0.90, max_ms),
+            "duration_ms_p99": histogram_percentile(hist, 0.99, max_ms),
+            "duration_ms_max": max_ms,
+            "tool_usage": dict(sorted(agg["tool_usage"].items(), key=lambda kv: -kv[1])),
+        }
+    return results
+
+
+def since_bucket(hours: float, now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest bucket overlapping the last `hours` hours."""
+    now = now or datetime.now(timezone.utc)
+    return bucket_start(now - timedelta(hours=hours))
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "saol-mcp-server")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+
+
+@dataclass
+class Span:
+    """
+    A timed phase of a tool call. Spans of one call share a trace_id;
+    the root span is opened by the telemetry middleware.
+    """
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+# The active span of the current call. asyncio tasks and asyncio.to_thread copy the context,
+# so spans opened inside tool functions attach to the call that invoked them.
+_current_span: ContextVar[Optional[Span]] = ContextVar("saol_current_span", default=None)
+# All spans finished so far within the current trace.
+_trace_spans: ContextVar[Optional[List[Span]]] = ContextVar("saol_trace_spans", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Context manager that records a span for the enclosed block.
+    Opens a new trace if no span is active; the trace is exported when its root span ends.
+    """
+    parent = _current_span.get()
+    is_root = parent is None
+    s = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+    span_token = _current_span.set(s)
+    trace_token = _trace_spans.set([]) if is_root else None
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        spans = _trace_spans.get()
+        if spans is not None:
+            spans.append(s)
+        _current_span.reset(span_token)
+        if is_root:
+            _trace_spans.reset(trace_token)
+            _finish_trace(spans)
+
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes):
+    """Records an already-measured phase (e.g. queueing delay) as a child of the active span."""
+    parent = _current_span.get()
+    spans = _trace_spans.get()
+    if parent is None or spans is None:
+        return
+    spans.append(Span(
+        name=name,
+        trace_id=parent.trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id,
+        start_ns=start_ns,
+        end_ns=end_ns,
+        attributes=attributes,
+    ))
+
+
+def _finish_trace(spans: List[Span]):
+    root = spans[-1]
+    phases = ", ".join(f"{s.name}={s.duration * 1000:.1f}ms" for s in spans[:-1])
+    print(f"[TRACE] {root.name} {root.duration * 1000:.1f}ms [{phases}] trace_id={root.trace_id}")
+    if exporter:
+        exporter.export(spans)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: List[Span]) -> Dict[str, Any]:
+    """Encodes spans as an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "saol.tracing"},
+                "spans": [{
+                    "traceId": s.trace_id,
+                    "spanId": s.span_id,
+                    "parentSpanId": s.parent_id or "",
+                    "name": s.name,
+                    "kind": 2 if s.parent_id is None else 1,  # SERVER for the tool call, INTERNAL for phases
+                    "startTimeUnixNano": str(s.start_ns),
+                    "endTimeUnixNano": str(s.end_ns),
+                    "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                    "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+                } for s in spans],
+            }],
+        }],
+    }
+
+
+class OTLPExporter:
+    """
+    Ships finished traces to an OTLP/HTTP collector (JSON encoding) from a background thread,
+    so tool calls never wait on the collector. Traces are dropped if the queue is full.
+    """
+
+    def __init__(self, endpoint: str, max_queue: int = 1024, batch_size: int = 64, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: List[Span]):
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("OTLP export queue full. Dropping trace.")
+
+    def _run(self):
+        while True:
+            batch = list(self._queue.get())
+            while len(batch) < self.batch_size:
+                try:
+                    batch.extend(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._post(batch)
+
+    def _post(self, spans: List[Span]):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(to_otlp(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except Exception as e:
+            logger.warning(f"Failed to export {len(spans)} spans to {self.url}: {e}")
+
+
+exporter: Optional[OTLPExporter] = OTLPExporter(OTLP_ENDPOINT) if OTLP_ENDPOINT else None
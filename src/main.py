@@ -1,20 +1,28 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Header, HTTPException
+from fastapi.responses import PlainTextResponse, JSONResponse
+from contextlib import asynccontextmanager
 from mcp.server.sse import SseServerTransport
 from mcp.server import FastMCP
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
 import uvicorn
 import asyncio
+import hmac
+import os
 
 # Initialize MCP Server (FastMCP)
 mcp = FastMCP("saol-mcp-server")
 
 # Import Tools
-from src.tools.firebase_ops import init_firebase, read_queue, update_ticket
-from src.tools.graph_ops import init_neo4j, cypher_query
-from src.tools.drive_ops import upload_file, delete_file
-from src.tools.telemetry_ops import log_mission_receipt
+from src.tools.firebase_ops import init_firebase, read_queue, update_ticket, probe_firestore
+from src.tools.graph_ops import init_neo4j, cypher_query, probe_neo4j
+from src.tools.drive_ops import upload_file, delete_file, probe_drive
+from src.tools.telemetry_ops import log_mission_receipt, query_telemetry
 from src.middleware.guardian import guardian_middleware
 from src.middleware.telemetry import telemetry_middleware
+from src.middleware.spill import spill_middleware
+from src.core.result_store import result_store
+from src.core.profiler import sample_profile, ProfilerBusyError
+from src.core.health import prober
 
 # Register Tools with Middleware (Chain: Telemetry -> Guardian -> Tool)
 # Telemetry should wrap Guardian so it captures the Guardian's block as a result?
@@ -31,13 +39,14 @@ def apply_middleware(tool_func):
     return telemetry_middleware(guardian_middleware(tool_func))
 
 mcp.tool()(apply_middleware(init_firebase))
-mcp.tool()(apply_middleware(read_queue))
+mcp.tool()(apply_middleware(spill_middleware(read_queue)))
 mcp.tool()(apply_middleware(update_ticket))
 mcp.tool()(apply_middleware(init_neo4j))
-mcp.tool()(apply_middleware(cypher_query))
+mcp.tool()(apply_middleware(spill_middleware(cypher_query)))
 mcp.tool()(apply_middleware(upload_file))
 mcp.tool()(apply_middleware(delete_file))
 mcp.tool()(apply_middleware(log_mission_receipt))
+mcp.tool()(apply_middleware(query_telemetry))
 
 # Define Health Check Tool
 @mcp.tool()
@@ -45,14 +54,70 @@ async def health_check() -> str:
     """Performs a health check and returns a green dot status."""
     return "Green Dot: Online. Nervous System Interface is active."
 
+# Spilled Results (see src/middleware/spill.py)
+# Oversized tool results are parked in the result store and read back here, whole or in byte ranges.
+@mcp.resource("saol://results/{result_id}", mime_type="application/json")
+def read_spilled_result(result_id: str) -> str:
+    """Returns a spilled tool result in full."""
+    data = result_store.read(result_id)
+    if data is None:
+        raise ValueError(f"Result {result_id} not found or expired")
+    return data.decode("ascii")
+
+@mcp.resource("saol://results/{result_id}/range/{offset}/{length}", mime_type="text/plain")
+def read_spilled_result_range(result_id: str, offset: int, length: int) -> str:
+    """Returns `length` bytes of a spilled tool result starting at `offset`."""
+    data = result_store.read(result_id, int(offset), int(length))
+    if data is None:
+        raise ValueError(f"Result {result_id} not found or expired")
+    return data.decode("ascii")
+
+# Background Health Prober
+# Probes run off the request path; tools consult the per-backend circuit breakers the prober maintains.
+prober.register("firestore", probe_firestore)
+prober.register("neo4j", probe_neo4j)
+prober.register("drive", probe_drive)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prober.start()
+    yield
+    await prober.stop()
+
 # Create a parent FastAPI app to handle routing
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
-# Add Health Check Route
+# Add Health Check Route (liveness: the process is up)
 @app.get("/status")
 async def handle_status():
     return {"status": "online", "message": "Green Dot: Online"}
 
+# Add Readiness Route (backends reachable, from the prober's cache)
+@app.get("/ready")
+async def handle_ready():
+    report = prober.readiness()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+# Admin: On-Demand Profiling
+# Disabled unless SAOL_ADMIN_TOKEN is set; callers must send it in the X-Admin-Token header.
+ADMIN_TOKEN = os.getenv("SAOL_ADMIN_TOKEN")
+
+@app.get("/admin/profile", response_class=PlainTextResponse)
+async def handle_profile(seconds: float = 5.0, interval_ms: float = 10.0, x_admin_token: str = Header(default="")):
+    """Samples the live process for `seconds` and returns collapsed stacks (flamegraph input)."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    # Compare bytes: compare_digest rejects non-ASCII str arguments.
+    if not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    try:
+        # Sample from a worker thread so the event loop keeps serving (and shows up in the profile).
+        return await asyncio.to_thread(sample_profile, seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # Mount the MCP SSE app
 # mcp.sse_app() returns an app that serves /sse and /messages
 # Mounting it at /sse means the full path will be /sse/sse
@@ -2,6 +2,7 @@ import functools
 import inspect
 from typing import Callable, Any
 from src.guardian.policy_engine import PolicyEngine, GuardianBlockError
+from src.core.tracing import span
 
 # Initialize Policy Engine
 policy_engine = PolicyEngine()
@@ -21,7 +22,8 @@ def guardian_middleware(func: Callable) -> Callable:
         
         print(f"[GUARDIAN] Intercepting tool: {tool_name}...")
         try:
-            policy_engine.check(tool_name, arguments, user_profile)
+            with span("guardian.policy", tool=tool_name):
+                policy_engine.check(tool_name, arguments, user_profile)
             print(f"[GUARDIAN] Verdict: ALLOWED.")
         except GuardianBlockError as e:
             print(f"[GUARDIAN] Security Alert: {e}")
@@ -0,0 +1,82 @@
+import functools
+import inspect
+import json
+import time
+from typing import Callable, Any, Dict, List
+from mcp.types import CallToolResult, ResourceLink, TextContent
+from src.core.tracing import span
+from src.core.result_store import (
+    result_store,
+    serialize_result,
+    SPILL_ENABLED,
+    SPILL_THRESHOLD_BYTES,
+)
+
+def _summarize(result: List[Dict[str, Any]]) -> Dict[str, Any]:
+    fields = set()
+    for item in result[:10]:
+        if isinstance(item, dict):
+            fields.update(item.keys())
+    return {"item_count": len(result), "fields": sorted(fields)}
+
+def spill_middleware(func: Callable) -> Callable:
+    """
+    Decorator that moves oversized list results into the result store.
+    Results above SAOL_SPILL_THRESHOLD_BYTES are replaced with a CallToolResult holding a summary
+    and an MCP resource link to `saol://results/<id>`, which can be read whole or in byte ranges.
+    The summary is also the structured result (a single-entry list), so the tool's output schema still holds.
+    Error results and small results are returned inline unchanged.
+    """
+    def _maybe_spill(result: Any) -> Any:
+        if not SPILL_ENABLED or not isinstance(result, list):
+            return result
+        if len(result) == 1 and isinstance(result[0], dict) and "error" in result[0]:
+            return result
+
+        with span("serialize", items=len(result)) as s:
+            payload = serialize_result(result)
+            s.attributes["bytes"] = len(payload)
+        if len(payload) <= SPILL_THRESHOLD_BYTES:
+            return result
+
+        try:
+            with span("result_store.put", bytes=len(payload)):
+                entry = result_store.put(payload, summary=_summarize(result))
+        except ValueError as e:
+            return [{"error": f"Result too large to return: {e}"}]
+
+        print(f"[SPILL] Tool '{func.__name__}' result of {entry.size_bytes} bytes stored at {entry.uri}")
+        summary = {
+            "spilled": True,
+            "resource_uri": entry.uri,
+            "range_uri_template": f"{entry.uri}/range/{{offset}}/{{length}}",
+            "mime_type": entry.mime_type,
+            "size_bytes": entry.size_bytes,
+            "expires_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(entry.expires_at)),
+            **entry.summary,
+        }
+        return CallToolResult(
+            content=[
+                TextContent(type="text", text=json.dumps(summary, indent=2)),
+                ResourceLink(
+                    type="resource_link",
+                    uri=entry.uri,
+                    name=f"{func.__name__}-{entry.result_id}",
+                    description=f"{func.__name__} result ({summary['item_count']} items), expires {summary['expires_at']}",
+                    mimeType=entry.mime_type,
+                    size=entry.size_bytes,
+                ),
+            ],
+            structuredContent={"result": [summary]},
+        )
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            return _maybe_spill(await func(*args, **kwargs))
+        return async_wrapper
+    else:
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            return _maybe_spill(func(*args, **kwargs))
+        return sync_wrapper
@@ -1,8 +1,10 @@
+import asyncio
 import functools
 import inspect
 import time
 from typing import Callable, Dict
 from collections import defaultdict
+from src.core.tracing import span, record_span
 
 # Simple in-memory store for the current session's tool usage.
 # In a real production server, this would be context-local (ContextVar).
@@ -25,6 +27,10 @@ tool_usage_stats: Dict[str, int] = defaultdict(int)
 def telemetry_middleware(func: Callable) -> Callable:
     """
     Decorator to track tool execution time and usage count.
+    Opens the root trace span of the call; phases inside the chain (policy check, backend I/O,
+    serialization) attach to it as child spans via src.core.tracing.
+    Synchronous tools are run on the default thread pool so they don't block the event loop,
+    and the time spent waiting for a worker thread is recorded as the 'executor_wait' span.
     """
     def _record_usage(tool_name: str, duration: float):
         tool_usage_stats[tool_name] += 1
@@ -36,7 +42,8 @@ def telemetry_middleware(func: Callable) -> Callable:
             tool_name = kwargs.get("name") or func.__name__
             start_time = time.time()
             try:
-                result = await func(*args, **kwargs)
+                with span(tool_name, tool=tool_name):
+                    result = await func(*args, **kwargs)
                 return result
             finally:
                 duration = time.time() - start_time
@@ -44,13 +51,21 @@ def telemetry_middleware(func: Callable) -> Callable:
         return async_wrapper
     else:
         @functools.wraps(func)
-        def sync_wrapper(*args, **kwargs):
+        async def offloaded_wrapper(*args, **kwargs):
             tool_name = kwargs.get("name") or func.__name__
             start_time = time.time()
             try:
-                result = func(*args, **kwargs)
+                with span(tool_name, tool=tool_name):
+                    submitted_ns = time.time_ns()
+
+                    def _run():
+                        record_span("executor_wait", submitted_ns, time.time_ns())
+                        return func(*args, **kwargs)
+
+                    # asyncio.to_thread copies the current context, so spans opened in the tool join this trace.
+                    result = await asyncio.to_thread(_run)
                 return result
             finally:
                 duration = time.time() - start_time
                 _record_usage(tool_name, duration)
-        return sync_wrapper
+        return offloaded_wrapper
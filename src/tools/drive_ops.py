@@ -6,12 +6,20 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 import io
 import google.auth
+from src.core.result_store import result_store
+from src.core.tracing import span
+from src.core.health import get_breaker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Breaker results are recorded by the health prober for probes and by the tools for inline calls,
+# never by shared helpers like _get_drive_service, so each attempt counts once.
+_breaker = get_breaker("drive")
 
 def _get_drive_service():
     """
@@ -29,20 +37,42 @@ def _get_drive_service():
 
     return build('drive', 'v3', credentials=creds)
 
-def upload_file(content: str, filename: str, folder_id: Optional[str] = None) -> str:
+def probe_drive():
+    """Health probe: authenticates and makes a minimal Drive API call. Raises on failure."""
+    service = _get_drive_service()
+    if not service:
+        raise RuntimeError("Google Drive authentication failed.")
+    service.about().get(fields='user').execute()
+
+def upload_file(filename: str, content: Optional[str] = None, folder_id: Optional[str] = None, source_uri: Optional[str] = None) -> str:
     """
-    Uploads a file to Google Drive.
+    Uploads a file to Google Drive. Exactly one of content and source_uri must be given.
     
     Args:
-        content (str): The text content of the file.
         filename (str): The name of the file.
+        content (Optional[str]): The text content of the file.
         folder_id (Optional[str]): The ID of the folder to upload to.
+        source_uri (Optional[str]): A spilled result (saol://results/<id>) to upload
+            server-side instead of passing its content inline.
         
     Returns:
         str: The webViewLink of the uploaded file, or an error message.
     """
+    if (content is None) == (source_uri is None):
+        return "Error: Provide exactly one of content or source_uri."
+
+    entry = None
+    if source_uri:
+        entry = result_store.resolve(source_uri)
+        if entry is None:
+            return f"Error: Result {source_uri} not found or expired."
+
+    if not _breaker.allow():
+        return f"Error: Google Drive unavailable: {_breaker.last_error}"
+
     service = _get_drive_service()
     if not service:
+        _breaker.record_failure("Google Drive authentication failed.")
         return "Error: Google Drive authentication failed."
 
     try:
@@ -50,16 +80,26 @@ def upload_file(content: str, filename: str, folder_id: Optional[str] = None) ->
         if folder_id:
             file_metadata['parents'] = [folder_id]
 
-        # Create a media upload object from the string content
-        fh = io.BytesIO(content.encode('utf-8'))
-        media = MediaIoBaseUpload(fh, mimetype='text/plain')
+        # Create a media upload object from the string content, or stream a stored result in chunks
+        if entry:
+            size = entry.size_bytes
+            fh = entry.open_stream()
+            media = MediaIoBaseUpload(fh, mimetype=entry.mime_type, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+        else:
+            data = content.encode('utf-8')
+            size = len(data)
+            fh = io.BytesIO(data)
+            media = MediaIoBaseUpload(fh, mimetype='text/plain')
 
-        file = service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id, webViewLink'
-        ).execute()
+        # Close the stream even if the upload fails; disk-backed results hold an open file.
+        with fh, span("drive.upload", bytes=size):
+            file = service.files().create(
+                body=file_metadata,
+                media_body=media,
+                fields='id, webViewLink'
+            ).execute()
 
+        _breaker.record_success()
         logger.info(f"File ID: {file.get('id')} uploaded successfully.")
         return file.get('webViewLink')
 
@@ -77,12 +117,18 @@ def delete_file(file_id: str) -> str:
     Returns:
         str: Success message or error.
     """
+    if not _breaker.allow():
+        return f"Error: Google Drive unavailable: {_breaker.last_error}"
+
     service = _get_drive_service()
     if not service:
+        _breaker.record_failure("Google Drive authentication failed.")
         return "Error: Google Drive authentication failed."
         
     try:
-        service.files().delete(fileId=file_id).execute()
+        with span("drive.delete"):
+            service.files().delete(fileId=file_id).execute()
+        _breaker.record_success()
         logger.info(f"File ID: {file_id} deleted successfully.")
         return f"Successfully deleted file {file_id}"
     except Exception as e:
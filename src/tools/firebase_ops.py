@@ -3,37 +3,73 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 from typing import List, Dict, Any, Optional
 import os
+import threading
 from datetime import datetime
+from src.core.tracing import span
+from src.core.health import get_breaker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 _db = None
+_breaker = get_breaker("firestore")
+# The health prober and tools (on worker threads) can initialize concurrently.
+_init_lock = threading.Lock()
+
+def _connect_firestore():
+    """Initializes the Firebase Admin SDK and Firestore client. Raises on failure."""
+    global _db
+    with _init_lock:
+        if _db:
+            return
+        if not firebase_admin._apps:
+            # Try to use ADC by default
+            logger.info("Initializing Firebase with Application Default Credentials...")
+            firebase_admin.initialize_app()
+        
+        _db = firestore.client()
 
 def init_firebase() -> bool:
     """
     Initializes the Firebase Admin SDK.
     Uses Application Default Credentials (ADC) or service account if provided.
-    Returns True if successful, False otherwise.
+    Returns True if successful, False otherwise (immediately, while the Firestore circuit is open).
     """
-    global _db
     if _db:
         return True
+    if not _breaker.allow():
+        logger.warning("Firestore circuit open. Skipping initialization.")
+        return False
 
     try:
-        if not firebase_admin._apps:
-            # Try to use ADC by default
-            logger.info("Initializing Firebase with Application Default Credentials...")
-            firebase_admin.initialize_app()
-        
-        _db = firestore.client()
+        with span("firestore.init"):
+            _connect_firestore()
+        _breaker.record_success()
         logger.info("Firebase initialized successfully.")
         return True
     except Exception as e:
+        _breaker.record_failure(str(e))
         logger.warning(f"Failed to initialize Firebase: {e}. Tools depending on Firebase will fail.")
         return False
 
+def _firestore_error() -> Optional[str]:
+    """
+    Returns why Firestore can't be used right now, or None if it can.
+    Fails fast while the circuit breaker is open instead of re-attempting initialization.
+    """
+    if not _breaker.allow():
+        return f"Firebase unavailable: {_breaker.last_error}"
+    if not _db and not init_firebase():
+        return "Firebase not initialized"
+    return None
+
+def probe_firestore():
+    """Health probe: performs a minimal read against Firestore. Raises on failure."""
+    if not _db:
+        _connect_firestore()
+    _db.collection('ticket_queue').limit(1).get()
+
 def read_queue(limit: int = 10) -> List[Dict[str, Any]]:
     """
     Reads pending tickets from the ticket queue.
@@ -44,19 +80,22 @@ def read_queue(limit: int = 10) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of ticket documents.
     """
-    if not _db and not init_firebase():
-        return [{"error": "Firebase not initialized"}]
+    error = _firestore_error()
+    if error:
+        return [{"error": error}]
 
     try:
         tickets_ref = _db.collection('ticket_queue')
         query = tickets_ref.where('status', '==', 'PENDING').limit(limit)
-        docs = query.stream()
         
         results = []
-        for doc in docs:
-            data = doc.to_dict()
-            data['id'] = doc.id
-            results.append(data)
+        # stream() is lazy; the round trips happen while iterating
+        with span("firestore.query", collection='ticket_queue', limit=limit) as s:
+            for doc in query.stream():
+                data = doc.to_dict()
+                data['id'] = doc.id
+                results.append(data)
+            s.attributes['documents'] = len(results)
             
         logger.info(f"Read {len(results)} tickets from queue.")
         return results
@@ -76,8 +115,9 @@ def update_ticket(ticket_id: str, status: str, result: Optional[str] = None) ->
     Returns:
         str: Success message or error description.
     """
-    if not _db and not init_firebase():
-        return "Error: Firebase not initialized"
+    error = _firestore_error()
+    if error:
+        return f"Error: {error}"
 
     try:
         ticket_ref = _db.collection('ticket_queue').document(ticket_id)
@@ -90,7 +130,8 @@ def update_ticket(ticket_id: str, status: str, result: Optional[str] = None) ->
         if result:
             update_data['result'] = result
             
-        ticket_ref.update(update_data)
+        with span("firestore.update", collection='ticket_queue'):
+            ticket_ref.update(update_data)
         logger.info(f"Updated ticket {ticket_id} to status {status}.")
         return f"Successfully updated ticket {ticket_id}"
     except Exception as e:
@@ -1,40 +1,82 @@
 import logging
 import os
+import threading
 from neo4j import GraphDatabase
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from src.core.tracing import span
+from src.core.health import get_breaker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 _driver = None
+_breaker = get_breaker("neo4j")
+# The health prober and tools (on worker threads) can initialize concurrently.
+_init_lock = threading.Lock()
 
-def init_neo4j() -> bool:
-    """
-    Initializes the Neo4j driver using environment variables.
-    Returns True if successful, False otherwise.
-    """
+def _connect_neo4j():
+    """Creates the Neo4j driver and verifies connectivity. Raises on failure."""
     global _driver
-    if _driver:
-        return True
-
     uri = os.getenv("NEO4J_URI")
     user = os.getenv("NEO4J_USER")
     password = os.getenv("NEO4J_PASSWORD")
 
     if not uri or not user or not password:
-        logger.warning("Neo4j environment variables (NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD) are missing.")
+        raise ValueError("Neo4j environment variables (NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD) are missing.")
+
+    with _init_lock:
+        if _driver:
+            return
+        driver = GraphDatabase.driver(uri, auth=(user, password))
+        try:
+            driver.verify_connectivity()
+        except Exception:
+            driver.close()
+            raise
+        # Only keep a driver that has connected once, so a failed init is retried.
+        _driver = driver
+
+def init_neo4j() -> bool:
+    """
+    Initializes the Neo4j driver using environment variables.
+    Returns True if successful, False otherwise (immediately, while the Neo4j circuit is open).
+    """
+    if _driver:
+        return True
+    if not _breaker.allow():
+        logger.warning("Neo4j circuit open. Skipping initialization.")
         return False
 
     try:
-        _driver = GraphDatabase.driver(uri, auth=(user, password))
-        _driver.verify_connectivity()
+        with span("neo4j.init"):
+            _connect_neo4j()
+        _breaker.record_success()
         logger.info("Neo4j driver initialized and connected.")
         return True
     except Exception as e:
+        _breaker.record_failure(str(e))
         logger.warning(f"Failed to initialize Neo4j driver: {e}. Tools depending on Neo4j will fail.")
         return False
 
+def _neo4j_error() -> Optional[str]:
+    """
+    Returns why Neo4j can't be used right now, or None if it can.
+    Fails fast while the circuit breaker is open instead of re-attempting initialization.
+    """
+    if not _breaker.allow():
+        return f"Neo4j unavailable: {_breaker.last_error}"
+    if not _driver and not init_neo4j():
+        return "Neo4j not initialized"
+    return None
+
+def probe_neo4j():
+    """Health probe: verifies connectivity to Neo4j. Raises on failure."""
+    if not _driver:
+        _connect_neo4j()
+    else:
+        _driver.verify_connectivity()
+
 def cypher_query(query: str, params: Dict[str, Any] = {}) -> List[Dict[str, Any]]:
     """
     Executes a Cypher query against the Neo4j database.
@@ -46,13 +88,15 @@ def cypher_query(query: str, params: Dict[str, Any] = {}) -> List[Dict[str, Any]
     Returns:
         List[Dict[str, Any]]: List of records returned by the query.
     """
-    if not _driver and not init_neo4j():
-        return [{"error": "Neo4j not initialized"}]
+    error = _neo4j_error()
+    if error:
+        return [{"error": error}]
 
     try:
-        with _driver.session() as session:
+        with span("neo4j.query") as s, _driver.session() as session:
             result = session.run(query, params)
             records = [record.data() for record in result]
+            s.attributes['records'] = len(records)
             logger.info(f"Executed Cypher query. Returned {len(records)} records.")
             return records
     except Exception as e:
@@ -1,15 +1,76 @@
 import logging
-from typing import Dict, Any
-from src.tools.firebase_ops import _db, init_firebase
+import re
+from typing import Dict, Any, Optional
+from firebase_admin import firestore
+from google.api_core.exceptions import InvalidArgument
+from src.tools import firebase_ops
 from src.core.telemetry_schema import MissionReceipt
+from src.core.telemetry_rollup import (
+    GROUP_BY_OPTIONS,
+    rollup_id,
+    rollup_increments,
+    since_bucket,
+    summarize_rollups,
+)
+from src.core.tracing import span
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Firestore rejects empty field names, reserved names like __name__, and field paths over 1500 bytes
+# (names are capped lower to leave room for the parent map's path).
+_RESERVED_FIELD = re.compile(r"^__.*__$")
+_MAX_FIELD_BYTES = 1024
+
+def _valid_field_name(key: Any) -> bool:
+    return (isinstance(key, str) and key != "" and not _RESERVED_FIELD.match(key)
+            and len(key.encode("utf-8")) <= _MAX_FIELD_BYTES)
+
+def _as_increments(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a (nested) map of numbers into Firestore Increment transforms.
+    Empty maps are dropped: with merge=True an empty map is written as a value and would replace the stored one.
+    Keys Firestore can't store as field names (e.g. an empty tool name) are skipped.
+    """
+    increments = {}
+    for key, value in values.items():
+        if not _valid_field_name(key):
+            logger.warning(f"Skipping invalid rollup field name {key!r}.")
+            continue
+        if isinstance(value, dict):
+            nested = _as_increments(value)
+            if nested:
+                increments[key] = nested
+        else:
+            increments[key] = firestore.Increment(value)
+    return increments
+
+def _rollup_update(receipt: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Returns (rollup document ID, fields to merge) for a receipt,
+    or None if the receipt doesn't match the MissionReceipt schema.
+    """
+    try:
+        parsed = MissionReceipt(**receipt)
+    except Exception as e:
+        logger.warning(f"Receipt does not match MissionReceipt schema. Skipping rollup: {e}")
+        return None
+
+    rollup = rollup_increments(parsed)
+    dims = rollup["dimensions"]
+    fields = {
+        **dims,
+        **_as_increments(rollup["increments"]),
+        "duration_ms_max": firestore.Maximum(rollup["duration_ms"]),
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+    return rollup_id(dims["bucket_start"], dims["spoke_id"], dims["profile"], dims["status"]), fields
+
 def log_mission_receipt(receipt: Dict[str, Any]) -> str:
     """
-    Logs the mission receipt to the 'telemetry_ledger' collection in Firestore.
+    Logs the mission receipt to the 'telemetry_ledger' collection in Firestore
+    and folds it into its hourly rollup in 'telemetry_rollups'.
     
     Args:
         receipt (Dict[str, Any]): The mission receipt data.
@@ -17,24 +78,90 @@ def log_mission_receipt(receipt: Dict[str, Any]) -> str:
     Returns:
         str: Success message or error.
     """
-    if not _db and not init_firebase():
-        return "Error: Firebase not initialized"
+    error = firebase_ops._firestore_error()
+    if error:
+        return f"Error: {error}"
 
     try:
-        # Validate against schema (optional but good practice)
-        # We assume the caller passes a dict that matches the schema, 
-        # or we could parse it: MissionReceipt(**receipt)
-        # Let's just write it.
-        
         # Use ticket_id as document ID or auto-generate?
         # Using ticket_id might overwrite if multiple spokes process same ticket (retries).
         # Better to use auto-id or composite key.
+        doc_ref = firebase_ops._db.collection('telemetry_ledger').document()
+        batch = firebase_ops._db.batch()
+        batch.set(doc_ref, receipt)
+
+        # The rollup is written in the same batch, so it never drifts from the ledger.
+        # Receipts that don't match the schema are still logged, just not aggregated,
+        # and a rollup write that can't be built or is rejected never costs us the ledger entry.
+        with_rollup = False
+        try:
+            rollup = _rollup_update(receipt)
+            if rollup:
+                rollup_ref = firebase_ops._db.collection('telemetry_rollups').document(rollup[0])
+                batch.set(rollup_ref, rollup[1], merge=True)
+                with_rollup = True
+        except Exception as e:
+            # WriteBatch.set validates before appending, so the batch still holds just the ledger write.
+            logger.warning(f"Could not build telemetry rollup. Logging receipt without it: {e}")
+
+        try:
+            with span("firestore.commit", collection='telemetry_ledger'):
+                batch.commit()
+        except InvalidArgument as e:
+            if not with_rollup:
+                raise
+            # The batch is atomic, so nothing was written; retry the ledger entry alone.
+            logger.warning(f"Telemetry rollup rejected. Logging receipt without it: {e}")
+            with span("firestore.set", collection='telemetry_ledger'):
+                doc_ref.set(receipt)
         
-        collection_ref = _db.collection('telemetry_ledger')
-        doc_ref = collection_ref.add(receipt)
-        
-        logger.info(f"Telemetry logged. Document ID: {doc_ref[1].id}")
-        return f"Telemetry logged successfully. ID: {doc_ref[1].id}"
+        logger.info(f"Telemetry logged. Document ID: {doc_ref.id}")
+        return f"Telemetry logged successfully. ID: {doc_ref.id}"
     except Exception as e:
         logger.error(f"Error logging telemetry: {e}")
         return f"Error logging telemetry: {e}"
+
+def query_telemetry(since_hours: float = 24, group_by: Optional[str] = "profile",
+                    spoke_id: Optional[str] = None, profile: Optional[str] = None,
+                    status: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Answers aggregate usage questions from the hourly telemetry rollups
+    (cost depends on the time range, not on the number of receipts logged).
+    
+    Args:
+        since_hours (float): How far back to look. Rounded out to whole hourly buckets.
+        group_by (Optional[str]): 'spoke_id', 'profile', 'status', 'bucket', or None for a single total.
+        spoke_id (Optional[str]): Only include this spoke.
+        profile (Optional[str]): Only include this profile.
+        status (Optional[str]): Only include this status (SUCCESS, FAILED, BLOCKED).
+        
+    Returns:
+        Dict[str, Any]: Per-group counts, token sums, duration percentiles and merged tool usage.
+    """
+    if group_by and group_by not in GROUP_BY_OPTIONS:
+        return {"error": f"Invalid group_by '{group_by}'. Expected one of {list(GROUP_BY_OPTIONS)}."}
+
+    error = firebase_ops._firestore_error()
+    if error:
+        return {"error": error}
+
+    try:
+        since = since_bucket(since_hours)
+        # Filter dimensions in memory: a range plus equality filters would need a composite index,
+        # and the rollup set for a time range is small regardless.
+        query = firebase_ops._db.collection('telemetry_rollups').where('bucket_start', '>=', since)
+        with span("firestore.query", collection='telemetry_rollups') as s:
+            docs = [doc.to_dict() for doc in query.stream()]
+            s.attributes['documents'] = len(docs)
+
+        groups = summarize_rollups(docs, group_by, {"spoke_id": spoke_id, "profile": profile, "status": status})
+        logger.info(f"Summarized {len(docs)} telemetry rollups into {len(groups)} groups.")
+        return {
+            "since": since.isoformat(),
+            "group_by": group_by,
+            "rollups_scanned": len(docs),
+            "groups": groups,
+        }
+    except Exception as e:
+        logger.error(f"Error querying telemetry: {e}")
+        return {"error": str(e)}